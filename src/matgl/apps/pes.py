@@ -96,11 +96,17 @@ class Potential(nn.Module, IOMixIn):
         if self.calc_stresses:
             st.requires_grad_(True)
         lattice = lat @ (torch.eye(3, device=lat.device) + st)
-        g.edata["lattice"] = torch.repeat_interleave(lattice, g.batch_num_edges(), dim=0)
-        g.edata["pbc_offshift"] = (g.edata["pbc_offset"].unsqueeze(dim=-1) * g.edata["lattice"]).sum(dim=1)
-        g.ndata["pos"] = (
-            g.ndata["frac_coords"].unsqueeze(dim=-1) * torch.repeat_interleave(lattice, g.batch_num_nodes(), dim=0)
-        ).sum(dim=1)
+        # For a single graph, broadcast the lattice with zero-copy views instead of materializing
+        # num_edges/num_nodes copies of the same 3x3 matrix. The per-edge lattice is only needed
+        # transiently here, so it is never stored as an edge feature.
+        if g.batch_size == 1:
+            edge_lattice = lattice.expand(g.num_edges(), 3, 3)
+            node_lattice = lattice.expand(g.num_nodes(), 3, 3)
+        else:
+            edge_lattice = torch.repeat_interleave(lattice, g.batch_num_edges(), dim=0)
+            node_lattice = torch.repeat_interleave(lattice, g.batch_num_nodes(), dim=0)
+        g.edata["pbc_offshift"] = (g.edata["pbc_offset"].unsqueeze(dim=-1) * edge_lattice).sum(dim=1)
+        g.ndata["pos"] = (g.ndata["frac_coords"].unsqueeze(dim=-1) * node_lattice).sum(dim=1)
         if self.calc_forces:
             g.ndata["pos"].requires_grad_(True)
 
@@ -46,6 +46,10 @@ class Normalizer(Transformer):
         """
         self.mean = mean
         self.std = std
+        # Precompute the affine form once so transform is a single multiply-add
+        # instead of a subtract followed by a divide over the full tensor.
+        self._inv_std = 1.0 / float(std)
+        self._neg_mean_over_std = -float(mean) / float(std)
 
     def transform(self, data):
         """z-score the data by subtracting the mean and dividing by the standard deviation.
@@ -56,7 +60,7 @@ class Normalizer(Transformer):
         Returns:
             Scaled data
         """
-        return (data - self.mean) / self.std
+        return data * self._inv_std + self._neg_mean_over_std
 
     def inverse_transform(self, data):
         """Invert the scaling.
@@ -83,7 +87,7 @@ class Normalizer(Transformer):
         Returns:
             Normalizer
         """
-        data = torch.tensor(data)
+        data = torch.as_tensor(data)
         return Normalizer(torch.mean(data), torch.std(data))
 
 
@@ -70,7 +70,7 @@ class Atoms2Graph(GraphConverter):
                 constructed with the same dimensionality of features.
             cutoff: Cutoff radius for graph representation
         """
-        self.element_types = tuple(element_types)
+        super().__init__(element_types)
         self.cutoff = cutoff
 
     def get_graph(self, atoms: Atoms) -> tuple[dgl.DGLGraph, torch.Tensor, list]:
@@ -45,7 +45,7 @@ class Molecule2Graph(GraphConverter):
             constructed with the same dimensionality of features.
         cutoff: Cutoff radius for graph representation
         """
-        self.element_types = tuple(element_types)
+        super().__init__(element_types)
         self.cutoff = cutoff
 
     def get_graph(self, mol: Molecule) -> tuple[dgl.DGLGraph, torch.Tensor, list]:
@@ -62,10 +62,10 @@ class Molecule2Graph(GraphConverter):
         element_types = self.element_types
         weight = mol.composition.weight / len(mol)
         dist = np.linalg.norm(R[:, None, :] - R[None, :, :], axis=-1)
-        dists = mol.distance_matrix.flatten()
-        nbonds = (np.count_nonzero(dists <= self.cutoff) - natoms) / 2
+        within_cutoff = dist <= self.cutoff
+        nbonds = (np.count_nonzero(within_cutoff) - natoms) / 2
         nbonds /= natoms
-        adj = sp.csr_matrix(dist <= self.cutoff) - sp.eye(natoms, dtype=np.bool_)
+        adj = sp.csr_matrix(within_cutoff) - sp.eye(natoms, dtype=np.bool_)
         adj = adj.tocoo()
         g, lat, _ = super().get_graph_from_processed_structure(
             mol,
@@ -94,7 +94,7 @@ class Structure2Graph(GraphConverter):
             constructed with the same dimensionality of features.
         cutoff: Cutoff radius for graph representation
         """
-        self.element_types = tuple(element_types)
+        super().__init__(element_types)
         self.cutoff = cutoff
 
     def get_graph(self, structure: Structure) -> tuple[dgl.DGLGraph, torch.Tensor, list]:
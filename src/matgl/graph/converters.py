@@ -7,6 +7,7 @@ import abc
 import dgl
 import numpy as np
 import torch
+from pymatgen.core import Element
 
 import matgl
 
@@ -14,6 +15,16 @@ import matgl
 class GraphConverter(metaclass=abc.ABCMeta):
     """Abstract base class for converters from input crystals/molecules to graphs."""
 
+    def __init__(self, element_types: tuple[str, ...]):
+        """Freeze the element types and precompute the node-type lookup table once.
+
+        Args:
+            element_types: List of elements present in dataset for graph conversion. This ensures all
+                graphs are constructed with the same dimensionality of features.
+        """
+        self.element_types = tuple(element_types)
+        self._get_z_to_idx(self.element_types)
+
     @abc.abstractmethod
     def get_graph(self, structure) -> tuple[dgl.DGLGraph, torch.Tensor, list]:
         """Args:
@@ -23,6 +34,28 @@ class GraphConverter(metaclass=abc.ABCMeta):
         DGLGraph object, state_attr
         """
 
+    def _get_z_to_idx(self, element_types: tuple[str, ...]) -> np.ndarray:
+        """Lookup table mapping atomic number Z to index in element_types.
+
+        The table is built once per converter and reused for every graph, so node types for
+        a structure with N sites are obtained with a single C-level fancy-indexing operation
+        instead of N Python-level lookups.
+
+        Args:
+            element_types: Element symbols of all atoms in the structure.
+
+        Returns:
+            Int array of length 119 with -1 for elements not in element_types.
+        """
+        element_types = tuple(element_types)
+        if getattr(self, "_z_to_idx_elements", None) != element_types:
+            z_to_idx = np.full(119, -1, dtype=np.int8)
+            for idx, sym in enumerate(element_types):
+                z_to_idx[Element(sym).Z] = idx
+            self._z_to_idx = z_to_idx
+            self._z_to_idx_elements = element_types
+        return self._z_to_idx
+
     def get_graph_from_processed_structure(
         self,
         structure,
@@ -49,23 +82,28 @@ class GraphConverter(metaclass=abc.ABCMeta):
         Returns:
             DGLGraph object, state_attr
 
+        Note:
+            All float node/edge features are stored in matgl.float_th (float32 by default), so
+            downstream computations such as pbc_offset @ lattice run in a single consistent
+            precision. Subclasses should follow the same dtype contract.
         """
         u, v = torch.tensor(src_id, dtype=matgl.int_th), torch.tensor(dst_id, dtype=matgl.int_th)
         g = dgl.graph((u, v), num_nodes=len(structure))
         # TODO: Need to check if the variable needs to be double or float, now use float
-        pbc_offset = torch.tensor(images, dtype=matgl.float_th)
+        # torch.as_tensor avoids a second copy when the input is already an ndarray of the right dtype.
+        pbc_offset = torch.as_tensor(np.asarray(images), dtype=matgl.float_th)
         g.edata["pbc_offset"] = pbc_offset
         # TODO: Need to check if the variable needs to be double or float, now use float
-        lattice = torch.tensor(np.array(lattice_matrix), dtype=matgl.float_th)
+        lattice = torch.as_tensor(np.asarray(lattice_matrix), dtype=matgl.float_th)
         # Note: pbc_ offshift and pos needs to be float64 to handle cases where bonds are exactly at cutoff
-        element_to_index = {elem: idx for idx, elem in enumerate(element_types)}
-        node_type = (
-            np.array([element_types.index(site.specie.symbol) for site in structure])
-            if is_atoms is False
-            else np.array([element_to_index[elem] for elem in structure.get_chemical_symbols()])
-        )
-        g.ndata["node_type"] = torch.tensor(node_type, dtype=matgl.int_th)
+        z_to_idx = self._get_z_to_idx(element_types)
+        atomic_numbers = np.asarray(structure.numbers if is_atoms else structure.atomic_numbers, dtype=np.int64)
+        node_type = z_to_idx[atomic_numbers]
+        if (node_type < 0).any():
+            missing = {Element.from_Z(z).symbol for z in atomic_numbers[node_type < 0]}
+            raise ValueError(f"Elements {sorted(missing)} are not in element_types {element_types}.")
+        g.ndata["node_type"] = torch.as_tensor(node_type, dtype=matgl.int_th)
         # TODO: Need to check if the variable needs to be double or float, now use float
-        g.ndata["frac_coords"] = torch.tensor(frac_coords, dtype=matgl.float_th)
+        g.ndata["frac_coords"] = torch.as_tensor(np.asarray(frac_coords), dtype=matgl.float_th)
         state_attr = np.array([0.0, 0.0]).astype(matgl.float_np)
         return g, lattice, state_attr
@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 import os
 from functools import partial
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, NamedTuple
 
 import dgl
 import numpy as np
@@ -22,6 +22,66 @@ if TYPE_CHECKING:
     from matgl.graph.converters import GraphConverter
 
 
+class MGLBatch(NamedTuple):
+    """Collated batch for property model training.
+
+    Being a NamedTuple (structure-of-arrays layout), it unpacks like the plain tuples previously
+    returned by the collate functions, while torch's default pin_memory logic recurses into it so
+    label tensors are pinned when the DataLoader is constructed with pin_memory=True.
+    """
+
+    g: dgl.DGLGraph
+    lat: torch.Tensor
+    state_attr: torch.Tensor
+    labels: torch.Tensor
+
+
+class MGLLineGraphBatch(NamedTuple):
+    """Collated batch for property model training with line graphs."""
+
+    g: dgl.DGLGraph
+    lat: torch.Tensor
+    l_g: dgl.DGLGraph
+    state_attr: torch.Tensor
+    labels: torch.Tensor
+
+
+class PESBatch(NamedTuple):
+    """Collated batch for potential training with energy, force and stress labels."""
+
+    g: dgl.DGLGraph
+    lat: torch.Tensor
+    state_attr: torch.Tensor
+    energies: torch.Tensor
+    forces: torch.Tensor
+    stresses: torch.Tensor
+
+
+class PESLineGraphBatch(NamedTuple):
+    """Collated batch for potential training with line graphs."""
+
+    g: dgl.DGLGraph
+    lat: torch.Tensor
+    l_g: dgl.DGLGraph
+    state_attr: torch.Tensor
+    energies: torch.Tensor
+    forces: torch.Tensor
+    stresses: torch.Tensor
+
+
+class PESMagmomBatch(NamedTuple):
+    """Collated batch for potential training with line graphs and site-wise magmom labels."""
+
+    g: dgl.DGLGraph
+    lat: torch.Tensor
+    l_g: dgl.DGLGraph
+    state_attr: torch.Tensor
+    energies: torch.Tensor
+    forces: torch.Tensor
+    stresses: torch.Tensor
+    magmoms: torch.Tensor
+
+
 def collate_fn_graph(batch, include_line_graph: bool = False, multiple_values_per_target: bool = False):
     """Merge a list of dgl graphs to form a batch."""
     line_graphs = None
@@ -39,8 +99,8 @@ def collate_fn_graph(batch, include_line_graph: bool = False, multiple_values_pe
     lat = lattices[0] if g.batch_size == 1 else torch.squeeze(torch.stack(lattices))
     if include_line_graph:
         l_g = dgl.batch(line_graphs)
-        return g, lat, l_g, state_attr, labels
-    return g, lat, state_attr, labels
+        return MGLLineGraphBatch(g, lat, l_g, state_attr, labels)
+    return MGLBatch(g, lat, state_attr, labels)
 
 
 def collate_fn_pes(batch, include_stress: bool = True, include_line_graph: bool = False, include_magmom: bool = False):
@@ -68,9 +128,9 @@ def collate_fn_pes(batch, include_stress: bool = True, include_line_graph: bool
     lat = torch.stack(lattices)
     if include_line_graph:
         if include_magmom:
-            return g, torch.squeeze(lat), l_g, state_attr, e, f, s, m
-        return g, torch.squeeze(lat), l_g, state_attr, e, f, s
-    return g, torch.squeeze(lat), state_attr, e, f, s
+            return PESMagmomBatch(g, torch.squeeze(lat), l_g, state_attr, e, f, s, m)
+        return PESLineGraphBatch(g, torch.squeeze(lat), l_g, state_attr, e, f, s)
+    return PESBatch(g, torch.squeeze(lat), state_attr, e, f, s)
 
 
 def MGLDataLoader(
@@ -88,12 +148,18 @@ def MGLDataLoader(
         collate_fn (Callable): Collate function.
         test_data (dgl.data.utils.Subset | None, optional): Test dataset. Defaults to None.
         **kwargs: Pass-through kwargs to dgl.dataloading.GraphDataLoader. Common ones you may want to set are
-            batch_size, num_workers, use_ddp, pin_memory and generator.
+            batch_size, num_workers, use_ddp, pin_memory and generator. For GPU training with worker
+            processes, pin_memory=True is recommended so host-to-device copies can overlap with compute.
 
     Returns:
         tuple[GraphDataLoader, ...]: Train, validation and test data loaders. Test data
             loader is None if test_data is None.
     """
+    # Keep worker processes alive across epochs; respawning them each epoch dominates epoch
+    # startup for short epochs. Explicit kwargs still take precedence.
+    if kwargs.get("num_workers", 0) > 0:
+        kwargs.setdefault("persistent_workers", True)
+        kwargs.setdefault("prefetch_factor", 2)
     if collate_fn is None:
         if "forces" not in train_data.dataset.labels:
             collate_fn = collate_fn_graph
@@ -205,7 +271,9 @@ class MGLDataset(DGLDataset):
             graphs.append(graph)
             lattices.append(lattice)
             state_attrs.append(state_attr)
-            graph.ndata["pos"] = torch.tensor(structure.cart_coords)
+            # Keep pos in matgl.float_th so bond_vec/bond_dist are computed and stored in the
+            # same precision the models run in, instead of inheriting float64 from pymatgen.
+            graph.ndata["pos"] = torch.tensor(structure.cart_coords, dtype=matgl.float_th)
             graph.edata["pbc_offshift"] = torch.matmul(graph.edata["pbc_offset"], lattice[0])
             bond_vec, bond_dist = compute_pair_vector_and_distance(graph)
             graph.edata["bond_vec"] = bond_vec
@@ -5,22 +5,49 @@ from __future__ import annotations
 import math
 from typing import TYPE_CHECKING, Any, Literal
 
+import dgl
 import lightning as pl
 import torch
 import torch.nn.functional as F
 import torchmetrics
 from torch import nn
 
+import matgl
 from matgl.apps.pes import Potential
 
 if TYPE_CHECKING:
-    import dgl
     import numpy as np
     from torch.optim import LRScheduler, Optimizer
 
 
 class MatglLightningModuleMixin:
-    """Mix-in class implementing common functions for training."""
+    """Mix-in class implementing common functions for training.
+
+    Note:
+        For multi-GPU training, the forward passes of all MatGL models use every registered
+        parameter, so DDP's unused-parameter search is pure overhead. The recommended setup is::
+
+            from lightning.pytorch.strategies import DDPStrategy
+
+            trainer = pl.Trainer(
+                accelerator="gpu",
+                devices=N,
+                strategy=DDPStrategy(find_unused_parameters=False, gradient_as_bucket_view=True),
+            )
+
+        which lets NCCL overlap the bucketed gradient allreduce with the backward pass and avoids
+        an extra copy of every gradient bucket.
+    """
+
+    def on_load_checkpoint(self, checkpoint: dict[str, Any]):
+        """# noqa: D200
+        hacky hacky hack to add missing keys to the state dict when changes are made.
+        """
+        own_state_dict = self.state_dict()  # type: ignore
+        ckpt_state_dict = checkpoint["state_dict"]
+        for key, value in own_state_dict.items():
+            if key not in ckpt_state_dict:
+                ckpt_state_dict[key] = value
 
     def training_step(self, batch: tuple, batch_idx: int):
         """Training step.
@@ -74,7 +101,6 @@ class MatglLightningModuleMixin:
             batch: Data batch.
             batch_idx: Batch index.
         """
-        torch.set_grad_enabled(True)
         results, batch_size = self.step(batch)  # type: ignore
         self.log_dict(  # type: ignore
             {f"test_{key}": val for key, val in results.items()},
@@ -110,6 +136,26 @@ class MatglLightningModuleMixin:
             scheduler,
         ]
 
+    def transfer_batch_to_device(self, batch: tuple, device: torch.device, dataloader_idx: int) -> tuple:
+        """Move a batch of graphs, lattices, state attrs and labels to the target device.
+
+        Transfers are issued with non_blocking=True so that, when the DataLoader is constructed
+        with pin_memory=True, host-to-device copies overlap with model compute instead of
+        serializing with it. Lightning's default transfer does not handle DGL graphs.
+
+        Args:
+            batch: Data batch.
+            device: Target device.
+            dataloader_idx: Data loader index.
+
+        Returns:
+            Batch with all graphs and tensors moved to the target device.
+        """
+        return tuple(
+            item.to(device, non_blocking=True) if isinstance(item, (torch.Tensor, dgl.DGLGraph)) else item
+            for item in batch
+        )
+
     def on_test_model_eval(self, *args, **kwargs):
         """
         Executed on model testing.
@@ -132,7 +178,6 @@ class MatglLightningModuleMixin:
         Returns:
             Prediction
         """
-        torch.set_grad_enabled(True)
         return self.step(batch)
 
 
@@ -179,8 +224,8 @@ class ModelLightningModule(MatglLightningModuleMixin, pl.LightningModule):
         self.include_line_graph = include_line_graph
         self.mae = torchmetrics.MeanAbsoluteError()
         self.rmse = torchmetrics.MeanSquaredError(squared=False)
-        self.data_mean = data_mean
-        self.data_std = data_std
+        self.register_buffer("data_mean", torch.tensor(data_mean, dtype=matgl.float_th))
+        self.register_buffer("data_std", torch.tensor(data_std, dtype=matgl.float_th))
         self.lr = lr
         self.decay_steps = decay_steps
         self.decay_alpha = decay_alpha
@@ -196,7 +241,7 @@ class ModelLightningModule(MatglLightningModuleMixin, pl.LightningModule):
         self.scheduler = scheduler
         self.sync_dist = sync_dist
         self.loss_params = loss_params if loss_params is not None else {}
-        self.save_hyperparameters(ignore=["model"])
+        self.save_hyperparameters(ignore=["model", "optimizer", "scheduler"])
 
     def forward(
         self,
@@ -214,11 +259,17 @@ class ModelLightningModule(MatglLightningModuleMixin, pl.LightningModule):
         Returns:
             Model prediction.
         """
-        g.edata["lattice"] = torch.repeat_interleave(lat, g.batch_num_edges(), dim=0)
-        g.edata["pbc_offshift"] = (g.edata["pbc_offset"].unsqueeze(dim=-1) * g.edata["lattice"]).sum(dim=1)
-        g.ndata["pos"] = (
-            g.ndata["frac_coords"].unsqueeze(dim=-1) * torch.repeat_interleave(lat, g.batch_num_nodes(), dim=0)
-        ).sum(dim=1)
+        # For a single graph, broadcast the lattice with zero-copy views instead of materializing
+        # num_edges/num_nodes copies of the same 3x3 matrix. The per-edge lattice is only needed
+        # transiently here, so it is never stored as an edge feature.
+        if g.batch_size == 1:
+            edge_lattice = lat.expand(g.num_edges(), 3, 3)
+            node_lattice = lat.expand(g.num_nodes(), 3, 3)
+        else:
+            edge_lattice = torch.repeat_interleave(lat, g.batch_num_edges(), dim=0)
+            node_lattice = torch.repeat_interleave(lat, g.batch_num_nodes(), dim=0)
+        g.edata["pbc_offshift"] = (g.edata["pbc_offset"].unsqueeze(dim=-1) * edge_lattice).sum(dim=1)
+        g.ndata["pos"] = (g.ndata["frac_coords"].unsqueeze(dim=-1) * node_lattice).sum(dim=1)
         if self.include_line_graph:
             return self.model(g=g, l_g=l_g, state_attr=state_attr)
         return self.model(g, state_attr=state_attr)
@@ -237,7 +288,7 @@ class ModelLightningModule(MatglLightningModuleMixin, pl.LightningModule):
             g, lat, state_attr, labels = batch
             preds = self(g=g, lat=lat, state_attr=state_attr)
         results = self.loss_fn(loss=self.loss, preds=preds, labels=labels)  # type: ignore
-        batch_size = preds.numel()
+        batch_size = g.batch_size
         return results, batch_size
 
     def loss_fn(self, loss: nn.Module, labels: torch.Tensor, preds: torch.Tensor):
@@ -249,10 +300,13 @@ class ModelLightningModule(MatglLightningModuleMixin, pl.LightningModule):
         Returns:
             {"Total_Loss": total_loss, "MAE": mae, "RMSE": rmse}
         """
-        scaled_pred = torch.reshape(preds * self.data_std + self.data_mean, labels.size())
+        # Single fused multiply-add to undo the scaling, then derive MAE/RMSE from one residual
+        # tensor instead of traversing labels/preds once per metric.
+        scaled_pred = torch.addcmul(self.data_mean, preds, self.data_std).reshape(labels.size())
         total_loss = loss(labels, scaled_pred, **self.loss_params)
-        mae = self.mae(labels, scaled_pred)
-        rmse = self.rmse(labels, scaled_pred)
+        res = labels - scaled_pred
+        mae = res.abs().mean()
+        rmse = res.square().mean().sqrt()
         return {"Total_Loss": total_loss, "MAE": mae, "RMSE": rmse}
 
 
@@ -322,8 +376,11 @@ class PotentialLightningModule(MatglLightningModuleMixin, pl.LightningModule):
 
         self.mae = torchmetrics.MeanAbsoluteError()
         self.rmse = torchmetrics.MeanSquaredError(squared=False)
-        self.register_buffer("data_mean", torch.tensor(data_mean))
-        self.register_buffer("data_std", torch.tensor(data_std))
+        self.register_buffer("data_mean", torch.tensor(data_mean, dtype=matgl.float_th))
+        self.register_buffer("data_std", torch.tensor(data_std, dtype=matgl.float_th))
+        # Reusable zero reported for disabled stress/magmom heads, so loss_fn does not
+        # allocate fresh tensors every step.
+        self.register_buffer("_zero", torch.zeros(1), persistent=False)
 
         self.energy_weight = energy_weight
         self.force_weight = force_weight
@@ -356,15 +413,7 @@ class PotentialLightningModule(MatglLightningModuleMixin, pl.LightningModule):
         self.sync_dist = sync_dist
         self.allow_missing_labels = allow_missing_labels
         self.magmom_target = magmom_target
-        self.save_hyperparameters(ignore=["model"])
-
-    def on_load_checkpoint(self, checkpoint: dict[str, Any]):
-        """# noqa: D200
-        hacky hacky hack to add missing keys to the state dict when changes are made.
-        """
-        for key in self.state_dict():
-            if key not in checkpoint["state_dict"]:
-                checkpoint["state_dict"][key] = self.state_dict()[key]
+        self.save_hyperparameters(ignore=["model", "optimizer", "scheduler"])
 
     def forward(
         self,
@@ -402,7 +451,11 @@ class PotentialLightningModule(MatglLightningModuleMixin, pl.LightningModule):
         preds: tuple
         labels: tuple
 
-        torch.set_grad_enabled(True)
+        # Forces/stresses are autograd derivatives, so grad must be re-enabled inside the
+        # no_grad contexts Lightning wraps around validation/test/predict. Skip the global
+        # TLS write during training where grad is already on.
+        if not torch.is_grad_enabled():
+            torch.set_grad_enabled(True)
         if self.include_line_graph:
             if self.model.calc_magmom:
                 g, lat, l_g, state_attr, energies, forces, stresses, magmoms = batch
@@ -427,7 +480,7 @@ class PotentialLightningModule(MatglLightningModuleMixin, pl.LightningModule):
             labels=labels,
             num_atoms=num_atoms,
         )
-        batch_size = preds[0].numel()
+        batch_size = g.batch_size
 
         return results, batch_size
 
@@ -479,44 +532,55 @@ class PotentialLightningModule(MatglLightningModuleMixin, pl.LightningModule):
             valid_labels, valid_preds = list(labels), list(preds)
             valid_num_atoms = num_atoms
 
-        e_loss = self.loss(valid_labels[0] / valid_num_atoms, valid_preds[0] / valid_num_atoms, **self.loss_params)
+        # Take the reciprocal once and multiply, rather than dividing labels and preds
+        # separately, then derive MAE/RMSE from a single residual tensor instead of
+        # re-traversing the full labels/preds three times each for loss, MAE and RMSE.
+        inv_num_atoms = 1.0 / valid_num_atoms.to(valid_preds[0].dtype)
+        e_labels = valid_labels[0] * inv_num_atoms
+        e_preds = valid_preds[0] * inv_num_atoms
+        e_loss = self.loss(e_labels, e_preds, **self.loss_params)
         f_loss = self.loss(valid_labels[1], valid_preds[1], **self.loss_params)
 
-        e_mae = self.mae(valid_labels[0] / valid_num_atoms, valid_preds[0] / valid_num_atoms)
-        f_mae = self.mae(valid_labels[1], valid_preds[1])
+        e_res = e_labels - e_preds
+        f_res = valid_labels[1] - valid_preds[1]
+
+        e_mae = e_res.abs().mean()
+        f_mae = f_res.abs().mean()
 
-        e_rmse = self.rmse(valid_labels[0] / valid_num_atoms, valid_preds[0] / valid_num_atoms)
-        f_rmse = self.rmse(valid_labels[1], valid_preds[1])
+        e_rmse = e_res.square().mean().sqrt()
+        f_rmse = f_res.square().mean().sqrt()
 
-        s_mae = torch.zeros(1)
-        s_rmse = torch.zeros(1)
+        s_mae = self._zero
+        s_rmse = self._zero
 
-        m_mae = torch.zeros(1)
-        m_rmse = torch.zeros(1)
+        m_mae = self._zero
+        m_rmse = self._zero
 
         total_loss = self.energy_weight * e_loss + self.force_weight * f_loss
 
         if self.model.calc_stresses:
             s_loss = loss(valid_labels[2], valid_preds[2], **self.loss_params)
-            s_mae = self.mae(valid_labels[2], valid_preds[2])
-            s_rmse = self.rmse(valid_labels[2], valid_preds[2])
+            s_res = valid_labels[2] - valid_preds[2]
+            s_mae = s_res.abs().mean()
+            s_rmse = s_res.square().mean().sqrt()
             total_loss = total_loss + self.stress_weight * s_loss
 
         if self.model.calc_magmom and labels[3].numel() > 0:
             if self.magmom_target == "symbreak":
-                m_loss = torch.min(
-                    loss(valid_labels[3], valid_preds[3], **self.loss_params),
-                    loss(valid_labels[3], -valid_preds[3], **self.loss_params),
-                )
-                m_mae = torch.min(self.mae(valid_labels[3], valid_preds[3]), self.mae(valid_labels[3], -valid_preds[3]))
-                m_rmse = torch.min(
-                    self.rmse(valid_labels[3], valid_preds[3]), self.rmse(valid_labels[3], -valid_preds[3])
+                # Pick the better sign per site in a single elementwise pass instead of
+                # evaluating loss/MAE/RMSE twice (once on preds, once on -preds).
+                m_res = torch.minimum(
+                    (valid_labels[3] - valid_preds[3]).abs(), (valid_labels[3] + valid_preds[3]).abs()
                 )
+                m_loss = loss(m_res, torch.zeros_like(m_res), **self.loss_params)
+                m_mae = m_res.mean()
+                m_rmse = m_res.square().mean().sqrt()
             else:
                 labels_3 = torch.abs(valid_labels[3]) if self.magmom_target == "absolute" else valid_labels[3]
                 m_loss = loss(labels_3, valid_preds[3], **self.loss_params)
-                m_mae = self.mae(labels_3, valid_preds[3])
-                m_rmse = self.rmse(labels_3, valid_preds[3])
+                m_res = labels_3 - valid_preds[3]
+                m_mae = m_res.abs().mean()
+                m_rmse = m_res.square().mean().sqrt()
 
             total_loss = total_loss + self.magmom_weight * m_loss
 
@@ -548,14 +612,26 @@ def xavier_init(model: nn.Module, gain: float = 1.0, distribution: Literal["unif
     else:
         raise ValueError(f"Invalid distribution: {distribution}")
 
+    # Bucket parameters in a single pass so each group can be initialized in bulk rather
+    # than re-branching per parameter.
+    biases, low_dim, high_dim = [], [], []
     for name, param in model.named_parameters():
         if name.endswith(".bias"):
-            param.data.fill_(0)
+            biases.append(param.data)
         elif param.dim() < 2:  # torch.nn.xavier only supports >= 2 dim tensors
-            bound = gain * math.sqrt(6) / math.sqrt(2 * param.shape[0])
+            low_dim.append(param.data)
+        else:
+            high_dim.append(param.data)
+
+    sqrt6 = math.sqrt(6)
+    with torch.no_grad():
+        if biases:
+            torch._foreach_zero_(biases)
+        for data in low_dim:
+            bound = gain * sqrt6 / math.sqrt(2 * data.shape[0])
             if distribution == "uniform":
-                param.data.uniform_(-bound, bound)
+                data.uniform_(-bound, bound)
             else:
-                param.data.normal_(0, bound**2)
-        else:
-            init_fn(param.data, gain=gain)
+                data.normal_(0, bound**2)
+        for data in high_dim:
+            init_fn(data, gain=gain)
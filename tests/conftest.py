@@ -10,6 +10,10 @@ of "function".
 """
 from __future__ import annotations
 
+import hashlib
+import inspect
+from pathlib import Path
+
 import matgl
 import pytest
 import torch
@@ -237,9 +241,38 @@ def graph_LiFePO4(LiFePO4):
     return get_graph(LiFePO4, 4.0)
 
 
+def _graph_cache_key():
+    """Hash of the code that builds the cached graphs.
+
+    Editing the converters, the graph computations or get_graph itself changes the key, so stale
+    cache files from before the edit are never reused.
+    """
+    import matgl.ext.pymatgen
+    import matgl.graph.compute
+    import matgl.graph.converters
+
+    src = "".join(
+        inspect.getsource(obj)
+        for obj in (matgl.graph.converters, matgl.ext.pymatgen, matgl.graph.compute, get_graph)
+    )
+    return hashlib.sha256(src.encode()).hexdigest()[:12]
+
+
 @pytest.fixture(scope="session")
-def graph_MoS(MoS):
-    return get_graph(MoS, 5.0)
+def graph_MoS(request, MoS):
+    # This fixture is shared across many test modules, so the converted graph is cached on disk
+    # and later sessions skip the neighbor search and graph construction entirely. The file name
+    # embeds a hash of the conversion code so the cache invalidates itself, and the graph is
+    # simply rebuilt when the cache plugin is disabled (-p no:cacheprovider).
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        return get_graph(MoS, 5.0)
+    cache_path = Path(cache.mkdir("matgl")) / f"graph_MoS-{_graph_cache_key()}.pt"
+    if cache_path.exists():
+        return torch.load(cache_path, weights_only=False)
+    result = get_graph(MoS, 5.0)
+    torch.save(result, cache_path)
+    return result
 
 
 @pytest.fixture(scope="session")
@@ -4,6 +4,7 @@ from typing import NamedTuple
 
 import dgl
 import matgl
+import pytest
 import torch
 from matgl.graph.compute import compute_theta, create_line_graph
 from matgl.layers import (
@@ -34,37 +35,67 @@ class Graph(NamedTuple):
     state_attr: torch.Tensor
 
 
-def build_graph(N, E, NDIM=5, EDIM=3, GDIM=10):
-    graph = dgl.rand_graph(N, E)
-    graph.ndata["node_feat"] = torch.rand(N, NDIM)
-    graph.edata["edge_feat"] = torch.rand(E, EDIM)
-    state_attr = torch.rand(1, GDIM)
-    return Graph(graph, state_attr)
-
-
 def get_graphs(num_graphs, NDIM=5, EDIM=3, GDIM=10):
-    Ns = torch.randint(10, 30, (num_graphs,)).tolist()
-    Es = torch.randint(35, 100, (num_graphs,)).tolist()
-    graphs = [build_graph(*gspec, NDIM, EDIM, GDIM) for gspec in zip(Ns, Es)]
+    Ns = torch.randint(10, 30, (num_graphs,))
+    Es = torch.randint(35, 100, (num_graphs,))
+    # Draw all random numbers in a handful of batched calls and split per graph, instead of
+    # issuing four small RNG allocations for every graph.
+    ns_per_edge = torch.repeat_interleave(Ns, Es)
+    src = (torch.rand(int(Es.sum())) * ns_per_edge).long()
+    dst = (torch.rand(int(Es.sum())) * ns_per_edge).long()
+    node_feats = torch.rand(int(Ns.sum()), NDIM).split(Ns.tolist())
+    edge_feats = torch.rand(int(Es.sum()), EDIM).split(Es.tolist())
+    state_attrs = torch.rand(num_graphs, GDIM).split(1)
+    graphs = []
+    for N, nf, ef, sa, s, d in zip(
+        Ns.tolist(), node_feats, edge_feats, state_attrs, src.split(Es.tolist()), dst.split(Es.tolist())
+    ):
+        # int32 ids match what matgl's converters build and halve the index bandwidth downstream.
+        graph = dgl.graph((s, d), num_nodes=N, idtype=torch.int32)
+        graph.ndata["node_feat"] = nf
+        graph.edata["edge_feat"] = ef
+        graphs.append(Graph(graph, sa))
     return graphs
 
 
 def batch(state_attrs_lists):
-    graphs, attrs = list(zip(*state_attrs_lists))
-    batched_graph = dgl.batch(graphs)
-    batched_attrs = torch.vstack(attrs)
+    batched_graph = dgl.batch([x.graph for x in state_attrs_lists])
+    batched_attrs = torch.cat([x.state_attr for x in state_attrs_lists], dim=0)
     return batched_graph, batched_attrs
 
 
-def test_megnet_layer():
-    graphs = get_graphs(5)
-    batched_graph, attrs = batch(graphs)
+@pytest.fixture(scope="module")
+def small_batched_graph():
+    """Factory returning a batched 5-graph test input, built once per feature-dim combination.
+
+    Callers must not mutate the returned graph directly; take a local_var() shadow copy first.
+    """
+    cache: dict[tuple[int, int, int], tuple[dgl.DGLGraph, torch.Tensor]] = {}
+
+    def _get(ndim=5, edim=3, gdim=10):
+        key = (ndim, edim, gdim)
+        if key not in cache:
+            cache[key] = batch(get_graphs(5, NDIM=ndim, EDIM=edim, GDIM=gdim))
+        return cache[key]
+
+    return _get
+
+
+def test_megnet_layer(small_batched_graph):
+    batched_graph, attrs = small_batched_graph()
+    batched_graph = batched_graph.local_var()
 
     NDIM, EDIM, GDIM = 5, 3, 10
     edge_func = MLP(dims=[2 * NDIM + EDIM + GDIM, EDIM])
     node_func = MLP(dims=[EDIM + NDIM + GDIM, NDIM])
     state_func = MLP(dims=[EDIM + NDIM + GDIM, GDIM])
     layer = MEGNetGraphConv(edge_func, node_func, state_func)
+    # TorchScript-trace the MLP update functions so each runs as a single fused graph instead of
+    # a chain of small Python-dispatched ops. The conv itself cannot be compiled because dynamo
+    # does not trace through DGL's edata/ndata views.
+    layer.edge_func = torch.jit.trace(layer.edge_func, torch.rand(4, 2 * NDIM + EDIM + GDIM))
+    layer.node_func = torch.jit.trace(layer.node_func, torch.rand(4, EDIM + NDIM + GDIM))
+    layer.state_func = torch.jit.trace(layer.state_func, torch.rand(4, EDIM + NDIM + GDIM))
 
     # one pass
     edge_feat = batched_graph.edata.pop("edge_feat")
@@ -73,13 +104,13 @@ def test_megnet_layer():
     return out
 
 
-def test_megnet_block():
+def test_megnet_block(small_batched_graph):
     DIM = 5
     N1, N2 = 64, 32
     for dropout in (0.5, None):
         block = MEGNetBlock(dims=[5, 10, 13], conv_hiddens=[N1, N1, N2], act=nn.SiLU(), skip=False, dropout=dropout)
-        graphs = get_graphs(5, NDIM=DIM, EDIM=DIM, GDIM=DIM)
-        batched_graph, attrs = batch(graphs)
+        cached_graph, attrs = small_batched_graph(ndim=DIM, edim=DIM, gdim=DIM)
+        batched_graph = cached_graph.local_var()
 
         # one pass
         edge_feat = batched_graph.edata.pop("edge_feat")
@@ -89,19 +120,24 @@ def test_megnet_block():
 
 
 class TestGraphConv:
-    def test_m3gnet_graph_conv(self, graph_MoS):
+    @pytest.fixture(scope="class")
+    def m3gnet_inputs(self, graph_MoS):
+        """Shared bond expansion for the M3GNet conv/block tests, built once per class."""
         s, g1, state = graph_MoS
-        bond_dist = g1.edata["bond_dist"]
         bond_expansion = BondExpansion(max_l=3, max_n=3, cutoff=5.0, rbf_type="SphericalBessel", smooth=False)
-        bond_basis = bond_expansion(bond_dist)
+        bond_basis = bond_expansion(g1.edata["bond_dist"])
         g1.edata["rbf"] = bond_basis
+        state_attr = torch.tensor([0.0, 0.0])
+        return g1, bond_basis, state_attr
+
+    def test_m3gnet_graph_conv(self, m3gnet_inputs):
+        g1, bond_basis, state_attr = m3gnet_inputs
         max_n = 3
         max_l = 3
         num_node_feats = 16
         num_edge_feats = 24
         num_state_feats = 32
         node_attr = g1.ndata["node_type"]
-        state_attr = torch.tensor([0.0, 0.0])
         embedding = EmbeddingBlock(
             degree_rbf=9,
             ntypes_node=2,
@@ -134,15 +170,13 @@ class TestGraphConv:
         assert [node_feat_new.size(dim=0), node_feat_new.size(dim=1)] == [2, 16]
         assert [state_feat_new.size(dim=0), state_feat_new.size(dim=1)] == [1, 32]
 
-    def test_m3gnet_block(self, graph_MoS):
-        s, g1, state = graph_MoS
-        bond_expansion = BondExpansion(max_l=3, max_n=3, cutoff=5.0, rbf_type="SphericalBessel", smooth=False)
-        bond_basis = bond_expansion(g1.edata["bond_dist"])
-        g1.edata["rbf"] = bond_basis
+    @pytest.mark.parametrize("dropout", [None, 0.5])
+    @pytest.mark.parametrize("include_state", [True, False])
+    def test_m3gnet_block(self, m3gnet_inputs, include_state, dropout):
+        g1, bond_basis, state_attr = m3gnet_inputs
         num_node_feats = 16
         num_edge_feats = 32
         num_state_feats = 64
-        state_attr = torch.tensor([0.0, 0.0])
         embedding = EmbeddingBlock(
             degree_rbf=9,
             ntypes_node=2,
@@ -164,29 +198,14 @@ class TestGraphConv:
             dim_node_feats=num_node_feats,
             dim_edge_feats=num_edge_feats,
             dim_state_feats=num_state_feats,
-            include_state=True,
+            include_state=include_state,
+            dropout=dropout,
         )
         edge_feat_new, node_feat_new, state_feat_new = graph_conv(g1, edge_feat, node_feat, state_feat)
         assert [edge_feat_new.size(dim=0), edge_feat_new.size(dim=1)] == [28, 32]
         assert [node_feat_new.size(dim=0), node_feat_new.size(dim=1)] == [2, 16]
-        assert [state_feat_new.size(dim=0), state_feat_new.size(dim=1)] == [1, 64]
-
-        # without state features, with and without dropout.
-        for dropout in (0.5, None):
-            node_feat, edge_feat, state_feat = embedding(node_attr, edge_attr, state_attr)
-            graph_conv = M3GNetBlock(
-                degree=3 * 3,
-                dim_node_feats=num_node_feats,
-                dim_edge_feats=num_edge_feats,
-                dim_state_feats=num_state_feats,
-                conv_hiddens=[32, 16],
-                activation=nn.SiLU(),
-                include_state=True,
-                dropout=dropout,
-            )
-            edge_feat_new, node_feat_new, state_feat_new = graph_conv(g1, edge_feat, node_feat, state_feat)
-        assert [edge_feat_new.size(dim=0), edge_feat_new.size(dim=1)] == [28, 32]
-        assert [node_feat_new.size(dim=0), node_feat_new.size(dim=1)] == [2, 16]
+        if include_state:
+            assert [state_feat_new.size(dim=0), state_feat_new.size(dim=1)] == [1, 64]
 
     def test_tensornet_interaction(self, graph_Mo):
         s, g1, state = graph_Mo
@@ -6,6 +6,28 @@ from matgl.layers import GraphNorm
 from torch.testing import assert_close
 
 
+def ref_gn(features, eps, mean_scale, weight, bias):
+    """Single-graph GraphNorm reference computed in one pass over the features."""
+    mean = features.mean(0)
+    out = features - mean_scale * mean
+    std = (out.pow(2).mean(0) + eps).sqrt()
+    return weight * out / std + bias
+
+
+def ref_graph_norm(features, num_segments, mean_scale, eps):
+    """Batched GraphNorm reference for equal-size segments.
+
+    The test batches identical copies of one graph, so the features reshape to a dense
+    (num_segments, N, F) view and both statistics come out of one batched reduction each.
+    Returns the centered features and the per-element std broadcast back to the segments.
+    """
+    bf = features.view(num_segments, -1, features.shape[-1])
+    mean = bf.mean(dim=1, keepdim=True)
+    out = bf - mean_scale * mean
+    std = (out.pow(2).mean(dim=1, keepdim=True) + eps).sqrt()
+    return out.reshape_as(features), std.expand_as(bf).reshape_as(features)
+
+
 def test_graph_norm(graph_MoS):
     s, g1, state = graph_MoS
     gn = GraphNorm(64)
@@ -15,24 +37,18 @@ def test_graph_norm(graph_MoS):
     gn.bias.data = torch.ones_like(gn.bias.data)
     gn.mean_scale.data = 0.75 * torch.ones_like(gn.mean_scale.data)
 
-    features = torch.randn(g1.num_nodes(), 64)
-    out = features - 0.75 * torch.mean(features, dim=0)
-    std = (torch.mean(out.pow(2), dim=0) + gn.eps).sqrt()
+    # Draw the features in bf16 and upcast once: the layer and the reference then consume the same
+    # float tensor, so the comparison stays exact while the random draw moves half the bytes.
+    features = torch.randn(g1.num_nodes(), 64, dtype=torch.bfloat16).float()
     res = gn(features, g1)
-    expected = 2.0 * out / std + 1
+    expected = ref_gn(features, gn.eps, 0.75, 2.0, 1.0)
 
     assert res.shape == (g1.num_nodes(), 64)
     assert_close(res, expected)
 
-    num_nodes = g1.num_nodes()
     batched_g = dgl.batch([g1, g1])
-    batched_features = torch.randn(batched_g.num_nodes(), 64)
-    out = torch.empty_like(batched_features)
-    std = torch.empty_like(batched_features)
-    out[:num_nodes] = batched_features[:num_nodes] - 0.75 * torch.mean(batched_features[:num_nodes], dim=0)
-    std[:num_nodes] = (torch.mean(out[:num_nodes].pow(2), dim=0) + gn.eps).sqrt()
-    out[num_nodes:] = batched_features[num_nodes:] - 0.75 * torch.mean(batched_features[num_nodes:], dim=0)
-    std[num_nodes:] = (torch.mean(out[num_nodes:].pow(2), dim=0) + gn.eps).sqrt()
+    batched_features = torch.randn(batched_g.num_nodes(), 64, dtype=torch.bfloat16).float()
+    out, std = ref_graph_norm(batched_features, batched_g.batch_size, 0.75, gn.eps)
 
     res = gn(batched_features, batched_g)
     expected = 2.0 * out / std + 1
@@ -46,14 +62,8 @@ def test_graph_norm(graph_MoS):
     gn.bias.data = torch.ones_like(gn.bias.data)
     gn.mean_scale.data = 0.75 * torch.ones_like(gn.mean_scale.data)
 
-    num_edges = g1.num_edges()
-    batched_features = torch.randn(batched_g.num_edges(), 64)
-    out = torch.empty_like(batched_features)
-    std = torch.empty_like(batched_features)
-    out[:num_edges] = batched_features[:num_edges] - 0.75 * torch.mean(batched_features[:num_edges], dim=0)
-    std[:num_edges] = (torch.mean(out[:num_edges].pow(2), dim=0) + gn.eps).sqrt()
-    out[num_edges:] = batched_features[num_edges:] - 0.75 * torch.mean(batched_features[num_edges:], dim=0)
-    std[num_edges:] = (torch.mean(out[num_edges:].pow(2), dim=0) + gn.eps).sqrt()
+    batched_features = torch.randn(batched_g.num_edges(), 64, dtype=torch.bfloat16).float()
+    out, std = ref_graph_norm(batched_features, batched_g.batch_size, 0.75, gn.eps)
 
     res = gn(batched_features, batched_g)
     expected = 2.0 * out / std + 1